@@ -2,6 +2,9 @@ import argparse
 import pandas as pd
 import requests
 import os
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
 from urllib.parse import urlparse, unquote
 from datetime import datetime
 
@@ -14,6 +17,9 @@ default_column_attachment_type = "media_type"
 default_column_attachment_media_url = "media_url"
 default_input_filename = "output/facebook_page_media.csv"
 default_output_directory = "output/media/"
+default_plan_sample_size = 0
+default_plan_concurrency = 1
+default_plan_bandwidth = 100.0
 
 # Constants
 supported_formats = [
@@ -77,6 +83,87 @@ def download_file(url, save_path):
     return True
 
 
+def get_downloadable_media(dataframe, column_post_id, column_created_unix_timestamp, column_attachment_id, column_attachment_type, column_attachment_media_url):
+    for index, row in dataframe.iterrows():
+        attachment_type = row[column_attachment_type]
+        if attachment_type not in accepted_types:
+            continue
+
+        attachment_media_url = row.get(column_attachment_media_url)
+        if attachment_media_url is None:
+            continue
+
+        post_id = row[column_post_id]
+        created_unix_timestamp = row[column_created_unix_timestamp]
+        attachment_id = row[column_attachment_id]
+
+        parsed_date = datetime.fromtimestamp(created_unix_timestamp)
+        post_formatted_date = parsed_date.strftime(custom_date_format)
+
+        actual_filename = get_filename_from_url(attachment_media_url)
+        extension = get_media_format(actual_filename)
+        if extension.lower() not in supported_formats:
+            continue
+
+        filename = f"{post_id} {attachment_id} {post_formatted_date}.{extension}"
+
+        yield index, post_id, attachment_id, attachment_media_url, filename
+
+
+def get_file_size(url):
+    start = time.perf_counter()
+
+    try:
+        response = requests.head(url, allow_redirects=True)
+        response.raise_for_status()
+
+        content_length = response.headers.get("Content-Length")
+        size = int(content_length) if content_length is not None else None
+
+    except requests.exceptions.RequestException as e:
+        print(f"Failed to HEAD {url}: {e}")
+        return None, None
+
+    return size, time.perf_counter() - start
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours}h {minutes:02d}m {seconds:02d}s"
+
+
+def plan(urls, sample_size, concurrency, bandwidth):
+    sample = urls
+    if sample_size > 0 and sample_size < len(urls):
+        sample = random.sample(urls, sample_size)
+
+    with ThreadPoolExecutor(max_workers=concurrency) as executor:
+        results = list(executor.map(get_file_size, sample))
+
+    sizes = [size for size, _ in results if size is not None]
+    # Failed HEAD requests don't tell how long a download takes to start
+    latencies = [elapsed for _, elapsed in results if elapsed is not None]
+
+    average_size = sum(sizes) / len(sizes) if len(sizes) > 0 else 0.0
+    average_latency = sum(latencies) / len(latencies) if len(latencies) > 0 else 0.0
+    # Files without a known size (not sampled or no Content-Length) are assumed to be of average size
+    expected_bytes = int(sum(sizes) + average_size * (len(urls) - len(sizes)))
+
+    # Downloads run one after another, so every file pays its latency plus its transfer time
+    bytes_per_second = bandwidth * 1000 * 1000 / 8
+    expected_seconds = len(urls) * average_latency + expected_bytes / bytes_per_second
+
+    print(f"Plan for {len(urls)} downloadable media file(s):")
+    print(f"  Sampled: {len(sample)} URL(s) with {concurrency} concurrent HEAD request(s), {len(sizes)} reported a Content-Length")
+    print(f"Expected requests: {len(urls)}")
+    print(f"Expected bytes: {expected_bytes}{'' if len(sizes) == len(urls) else ' (estimated)'}")
+    print(f"Expected wall time: {format_duration(expected_seconds)} (sequential, {average_latency:.2f}s latency per file measured with {concurrency} concurrent HEAD request(s), at {bandwidth} Mbit/s)")
+
+    return 0
+
+
 def main():
     parser = argparse.ArgumentParser(description='Download media files from the generated Facebook posts attachments file (only those with media URL).')
     parser.add_argument(
@@ -121,9 +208,41 @@ def main():
         help='The ouput folder name which the media will be saved.',
         default=default_output_directory
     )
+    parser.add_argument(
+        '--plan',
+        action='store_true',
+        help='Estimate the requests, bytes and wall time of the download without running it.'
+    )
+    parser.add_argument(
+        '--plan_sample_size',
+        type=int,
+        help='Number of random media URLs checked when planning (0 means all URLs).',
+        default=default_plan_sample_size
+    )
+    parser.add_argument(
+        '--plan_concurrency',
+        type=int,
+        help='Number of concurrent HEAD requests sent when planning (use 1 to measure the latency without requests competing with each other).',
+        default=default_plan_concurrency
+    )
+    parser.add_argument(
+        '--plan_bandwidth',
+        type=float,
+        help='Expected download bandwidth in Mbit/s used to estimate the wall time when planning.',
+        default=default_plan_bandwidth
+    )
 
     args = parser.parse_args()
 
+    if args.plan_sample_size < 0:
+        parser.error('--plan_sample_size must be 0 or greater.')
+
+    if args.plan_concurrency < 1:
+        parser.error('--plan_concurrency must be 1 or greater.')
+
+    if args.plan_bandwidth <= 0:
+        parser.error('--plan_bandwidth must be greater than 0.')
+
     column_post_id = args.column_post_id
     column_created_unix_timestamp = args.column_created_unix_timestamp
     column_attachment_id = args.column_attachment_id
@@ -132,33 +251,24 @@ def main():
     csv_media_file = args.input_filename
     output_directory = args.output_directory
     
-    verify_directory(output_directory)
-
     dataframe = pd.read_csv(csv_media_file)
+    downloadable_media = get_downloadable_media(
+        dataframe,
+        column_post_id,
+        column_created_unix_timestamp,
+        column_attachment_id,
+        column_attachment_type,
+        column_attachment_media_url
+    )
 
-    successful_downloads = 0
-    for index, row in dataframe.iterrows():
-        attachment_type = row[column_attachment_type]
-        if attachment_type not in accepted_types:
-            continue
-
-        attachment_media_url = row.get(column_attachment_media_url)
-        if attachment_media_url is None:
-            continue
-
-        post_id = row[column_post_id]
-        created_unix_timestamp = row[column_created_unix_timestamp]
-        attachment_id = row[column_attachment_id]
-
-        parsed_date = datetime.fromtimestamp(created_unix_timestamp)
-        post_formatted_date = parsed_date.strftime(custom_date_format)
+    if args.plan:
+        urls = [attachment_media_url for _, _, _, attachment_media_url, _ in downloadable_media]
+        return plan(urls, args.plan_sample_size, args.plan_concurrency, args.plan_bandwidth)
 
-        actual_filename = get_filename_from_url(attachment_media_url)
-        extension = get_media_format(actual_filename)
-        if extension.lower() not in supported_formats:
-            continue
+    verify_directory(output_directory)
 
-        filename = f"{post_id} {attachment_id} {post_formatted_date}.{extension}"
+    successful_downloads = 0
+    for index, post_id, attachment_id, attachment_media_url, filename in downloadable_media:
         save_path = os.path.join(output_directory, filename)
 
         if download_file(attachment_media_url, save_path):
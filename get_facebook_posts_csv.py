@@ -3,12 +3,15 @@ import json
 import csv
 import argparse
 import os
+import time
 from dotenv import dotenv_values
 from datetime import datetime
 
 
 # Default arguments
 default_ouput_filename = "output/facebook_page_posts.csv"
+default_plan_sample_pages = 0
+default_plan_sample_details = 5
 
 # Constants
 facebook_post_date_format = "%Y-%m-%dT%H:%M:%S%z"
@@ -36,6 +39,87 @@ def get_request(url):
     return result
 
 
+def sample_paginated_edge(url, max_pages):
+    pages = 0
+    items = []
+    elapsed = 0.0
+    size = 0
+
+    while url is not None and url != '':
+        if max_pages > 0 and pages >= max_pages:
+            return pages, items, elapsed, size, False
+
+        start = time.perf_counter()
+        response = requests.get(url)
+        response.raise_for_status()
+        elapsed += time.perf_counter() - start
+        size += len(response.content)
+
+        page = json.loads(response.text)
+        pages += 1
+        items.extend(page['data'])
+        url = page['paging'].get('next') if 'paging' in page else None
+
+    return pages, items, elapsed, size, True
+
+
+def sample_detail_calls(urls):
+    elapsed = 0.0
+    size = 0
+
+    for url in urls:
+        start = time.perf_counter()
+        response = requests.get(url)
+        response.raise_for_status()
+        elapsed += time.perf_counter() - start
+        size += len(response.content)
+
+    return len(urls), elapsed, size
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours}h {minutes:02d}m {seconds:02d}s"
+
+
+def plan(page_id, facebook_access_token, max_pages, max_details):
+    feed_url = facebook_page_posts_endpoint.replace('page_id', page_id).replace('fb_access_token', facebook_access_token)
+    feed_pages, feed_posts, feed_elapsed, feed_size, feed_complete = sample_paginated_edge(feed_url, max_pages)
+
+    photos_url = facebook_page_photos_endpoint.replace('page_id', page_id).replace('fb_access_token', facebook_access_token)
+    photo_pages, photos, photo_elapsed, photo_size, photos_complete = sample_paginated_edge(photos_url, max_pages)
+
+    # Every photo needs an extra call to get its post details, only a few of them are run to measure their cost
+    detail_urls = [
+        facebook_page_post_details_endpoint.replace('post_id', photo["page_story_id"]).replace('fb_access_token', facebook_access_token)
+        for photo in photos[:max_details]
+        if photo.get("page_story_id") is not None
+    ]
+    detail_calls, detail_elapsed, detail_size = sample_detail_calls(detail_urls)
+    detail_latency = detail_elapsed / detail_calls if detail_calls > 0 else 0.0
+    detail_average_size = detail_size / detail_calls if detail_calls > 0 else 0.0
+
+    # Sampled list pages are counted at their measured cost, details calls are extrapolated
+    expected_requests = feed_pages + photo_pages + len(photos)
+    expected_bytes = feed_size + photo_size + len(photos) * detail_average_size
+    expected_seconds = feed_elapsed + photo_elapsed + len(photos) * detail_latency
+
+    print(f"Plan for page {page_id} (estimate):")
+    print(f"  Feed: {feed_pages} page(s) walked, {len(feed_posts)} post(s){'' if feed_complete else ', more pages not walked'}")
+    print(f"  Photos: {photo_pages} page(s) walked, {len(photos)} photo(s) requiring a details call each{'' if photos_complete else ', more pages not walked'}")
+    print(f"  Details: {detail_calls} call(s) sampled, {int(detail_average_size)} bytes and {detail_latency:.2f}s per call on average")
+    print(f"Estimated Graph API requests: {expected_requests}")
+    print(f"Estimated bytes transferred: {int(expected_bytes)}")
+    print(f"Estimated wall time: {format_duration(expected_seconds)} (sequential)")
+
+    if not feed_complete or not photos_complete:
+        print("Note: pages beyond --plan_sample_pages are not counted, so these figures are a lower bound. Leave it at 0 to walk every page.")
+
+    return 0
+
+
 def process_post(post):
     post_message = post.get("message")
     if post_message is not None:
@@ -88,8 +172,32 @@ def main():
         help="The output CSV file containing all info of the posts.",
         default=default_ouput_filename,
     )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Estimate the Graph API requests, bytes and wall time of the extraction without running it.",
+    )
+    parser.add_argument(
+        "--plan_sample_pages",
+        type=int,
+        help="Maximum number of pages sampled per paginated edge when planning (0 means all pages).",
+        default=default_plan_sample_pages,
+    )
+    parser.add_argument(
+        "--plan_sample_details",
+        type=int,
+        help="Maximum number of post details calls run to measure their cost when planning.",
+        default=default_plan_sample_details,
+    )
 
     args = parser.parse_args()
+
+    if args.plan_sample_pages < 0:
+        parser.error("--plan_sample_pages must be 0 or greater.")
+
+    if args.plan_sample_details < 0:
+        parser.error("--plan_sample_details must be 0 or greater.")
+
     env_vars = dotenv_values(".env")
 
     if env_vars[facebook_access_token_env_name] is None:
@@ -100,6 +208,18 @@ def main():
     page_id = args.page_id
     output_filename = args.output_filename
 
+    if args.plan:
+        try:
+            return plan(page_id, facebook_access_token, args.plan_sample_pages, args.plan_sample_details)
+
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to GET while planning: {e}")
+            return 1
+
+        except Exception as e:
+            print(f"An error occurred while planning: {e}")
+            return 1
+
     verify_directory(output_filename)
 
     data = []
@@ -3,12 +3,16 @@ import json
 import csv
 import argparse
 import os
+import math
+import time
 from dotenv import dotenv_values
 from datetime import datetime
 
 
 # Default arguments
 default_ouput_filename = "output/facebook_page_media.csv"
+default_plan_sample_pages = 0
+default_plan_sample_details = 5
 
 # Constants
 facebook_post_date_format = "%Y-%m-%dT%H:%M:%S%z"
@@ -17,6 +21,8 @@ facebook_page_post_ids_endpoint = "https://graph.facebook.com/v20.0/page_id/post
 facebook_page_post_details_endpoint = "https://graph.facebook.com/v20.0/post_id?fields=id,created_time,permalink_url,attachments&access_token=fb_access_token"
 facebook_page_album_ids_endpoint = "https://graph.facebook.com/v20.0/page_id/albums?fields=id&access_token=fb_access_token"
 facebook_page_photos_endpoint = "https://graph.facebook.com/v20.0/entity_id/photos?fields=id,page_story_id,created_time,name,alt_text,images,link,height,width&access_token=fb_access_token"
+facebook_page_album_counts_endpoint = "https://graph.facebook.com/v20.0/page_id/albums?fields=id,count&access_token=fb_access_token"
+facebook_photos_page_size = 25 # Graph API default page size for the photos edge
 supported_types = [
     'album',
     'photo',
@@ -48,6 +54,115 @@ def get_request(url):
     return result
 
 
+def sample_paginated_edge(url, max_pages):
+    pages = 0
+    items = []
+    elapsed = 0.0
+    size = 0
+
+    while url is not None and url != '':
+        if max_pages > 0 and pages >= max_pages:
+            return pages, items, elapsed, size, False
+
+        start = time.perf_counter()
+        response = requests.get(url)
+        response.raise_for_status()
+        elapsed += time.perf_counter() - start
+        size += len(response.content)
+
+        page = json.loads(response.text)
+        pages += 1
+        items.extend(page['data'])
+        url = page['paging'].get('next') if 'paging' in page else None
+
+    return pages, items, elapsed, size, True
+
+
+def sample_detail_calls(urls):
+    elapsed = 0.0
+    size = 0
+
+    for url in urls:
+        start = time.perf_counter()
+        response = requests.get(url)
+        response.raise_for_status()
+        elapsed += time.perf_counter() - start
+        size += len(response.content)
+
+    return len(urls), elapsed, size
+
+
+def format_duration(seconds):
+    minutes, seconds = divmod(int(round(seconds)), 60)
+    hours, minutes = divmod(minutes, 60)
+
+    return f"{hours}h {minutes:02d}m {seconds:02d}s"
+
+
+def plan(page_id, facebook_access_token, max_pages, max_details):
+    posts_url = facebook_page_post_ids_endpoint.replace('page_id', page_id).replace('fb_access_token', facebook_access_token)
+    post_pages, posts, post_elapsed, post_size, posts_complete = sample_paginated_edge(posts_url, max_pages)
+
+    # Every post needs an extra call to get its attachments, only a few of them are run to measure their cost
+    detail_urls = [
+        facebook_page_post_details_endpoint.replace('post_id', post["id"]).replace('fb_access_token', facebook_access_token)
+        for post in posts[:max_details]
+    ]
+    detail_calls, detail_elapsed, detail_size = sample_detail_calls(detail_urls)
+    detail_latency = detail_elapsed / detail_calls if detail_calls > 0 else 0.0
+    detail_average_size = detail_size / detail_calls if detail_calls > 0 else 0.0
+
+    # Profile photos are retrieved by treating the page itself as an album
+    photos_url = facebook_page_photos_endpoint.replace('entity_id', page_id).replace('fb_access_token', facebook_access_token)
+    photo_pages, photos, photo_elapsed, photo_size, photos_complete = sample_paginated_edge(photos_url, max_pages)
+
+    # Album photo pages are derived from each album's photo count instead of being walked
+    albums_url = facebook_page_album_counts_endpoint.replace('page_id', page_id).replace('fb_access_token', facebook_access_token)
+    album_pages, albums, album_elapsed, album_size, albums_complete = sample_paginated_edge(albums_url, max_pages)
+    album_photos = sum(album.get("count", 0) for album in albums)
+    album_photo_pages = sum(max(1, math.ceil(album.get("count", 0) / facebook_photos_page_size)) for album in albums)
+
+    # The first page of the biggest album is run to measure the cost of a full photos page
+    sample_album_pages, sample_album_photos, sample_album_elapsed, sample_album_size = 0, [], 0.0, 0
+    if len(albums) > 0:
+        biggest_album = max(albums, key=lambda album: album.get("count", 0))
+        sample_album_url = facebook_page_photos_endpoint.replace('entity_id', biggest_album["id"]).replace('fb_access_token', facebook_access_token)
+        sample_album_pages, sample_album_photos, sample_album_elapsed, sample_album_size, _ = sample_paginated_edge(sample_album_url, 1)
+
+    sampled_photo_pages = photo_pages + sample_album_pages
+    sampled_photos = len(photos) + len(sample_album_photos)
+    photo_page_latency = (photo_elapsed + sample_album_elapsed) / sampled_photo_pages if sampled_photo_pages > 0 else 0.0
+    photo_average_size = (photo_size + sample_album_size) / sampled_photos if sampled_photos > 0 else 0.0
+
+    # Walked list pages are counted at their measured cost, the rest is extrapolated
+    expected_requests = post_pages + len(posts) + photo_pages + album_pages + album_photo_pages
+    expected_bytes = (
+        post_size + photo_size + album_size + sample_album_size
+        + len(posts) * detail_average_size
+        + max(0, album_photos - len(sample_album_photos)) * photo_average_size
+    )
+    expected_seconds = (
+        post_elapsed + photo_elapsed + album_elapsed + sample_album_elapsed
+        + len(posts) * detail_latency
+        + max(0, album_photo_pages - sample_album_pages) * photo_page_latency
+    )
+
+    print(f"Plan for page {page_id} (estimate):")
+    print(f"  Posts: {post_pages} page(s) walked, {len(posts)} post(s) requiring a details call each{'' if posts_complete else ', more pages not walked'}")
+    print(f"  Details: {detail_calls} call(s) sampled, {int(detail_average_size)} bytes and {detail_latency:.2f}s per call on average")
+    print(f"  Profile photos: {photo_pages} page(s) walked, {len(photos)} photo(s){'' if photos_complete else ', more pages not walked'}")
+    print(f"  Albums: {album_pages} page(s) walked, {len(albums)} album(s), {album_photos} photo(s) in {album_photo_pages} page(s){'' if albums_complete else ', more pages not walked'}")
+    print(f"  Photo pages: {sampled_photo_pages} page(s) sampled, {int(photo_average_size)} bytes per photo and {photo_page_latency:.2f}s per page on average")
+    print(f"Estimated Graph API requests: {expected_requests}")
+    print(f"Estimated bytes transferred: {int(expected_bytes)}")
+    print(f"Estimated wall time: {format_duration(expected_seconds)} (sequential)")
+
+    if not posts_complete or not photos_complete or not albums_complete:
+        print("Note: pages beyond --plan_sample_pages are not counted, so these figures are a lower bound. Leave it at 0 to walk every page.")
+
+    return 0
+
+
 def extract_attachments(node, field):
     if node is None:
         return []
@@ -201,8 +316,32 @@ def main():
         help="The output CSV file containing all attachment info of the posts.",
         default=default_ouput_filename,
     )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Estimate the Graph API requests, bytes and wall time of the extraction without running it.",
+    )
+    parser.add_argument(
+        "--plan_sample_pages",
+        type=int,
+        help="Maximum number of pages sampled per paginated edge when planning (0 means all pages).",
+        default=default_plan_sample_pages,
+    )
+    parser.add_argument(
+        "--plan_sample_details",
+        type=int,
+        help="Maximum number of post details calls run to measure their cost when planning.",
+        default=default_plan_sample_details,
+    )
 
     args = parser.parse_args()
+
+    if args.plan_sample_pages < 0:
+        parser.error("--plan_sample_pages must be 0 or greater.")
+
+    if args.plan_sample_details < 0:
+        parser.error("--plan_sample_details must be 0 or greater.")
+
     env_vars = dotenv_values(".env")
 
     if env_vars[facebook_access_token_env_name] is None:
@@ -213,6 +352,18 @@ def main():
     page_id = args.page_id
     output_filename = args.output_filename
 
+    if args.plan:
+        try:
+            return plan(page_id, facebook_access_token, args.plan_sample_pages, args.plan_sample_details)
+
+        except requests.exceptions.RequestException as e:
+            print(f"Failed to GET while planning: {e}")
+            return 1
+
+        except Exception as e:
+            print(f"An error occurred while planning: {e}")
+            return 1
+
     verify_directory(output_filename)
 
     data = {}